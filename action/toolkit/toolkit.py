@@ -32,17 +32,27 @@ This example shows how to use these toolkit methods::
 from __future__ import annotations
 from typing import Sequence, Optional, Dict, Callable, Tuple, Any
 from dataclasses import dataclass
-from collections import namedtuple
 import argparse
+import functools
+import json
 import logging
 import os
 import os.path
+import sys
+import tempfile
 import yaml
 
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
 
 logging.basicConfig(format="%(levelname)s:%(message)s", level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+SECRET_PATTERNS = ('token', 'secret', 'password', 'key')
+
 
 @dataclass
 class ActionSpec:
@@ -66,6 +76,11 @@ class ActionSpec:
         This function will set any default values for the Action.
     do_action: Callable
         This function will perform the Action.
+    secret_patterns: list of str
+        Arguments with a name containing any of these patterns are masked
+        when logged. The match is a plain (case insensitive) substring test,
+        so ``key`` also masks names like ``keyword``. A single pattern may be
+        given as a str. Defaults to ``SECRET_PATTERNS``.
     """
     filename: str
     name: str
@@ -74,11 +89,53 @@ class ActionSpec:
     env_prefix: str = None
     set_defaults: Callable[[Dict[str, str]], Dict[str, str]] = None
     do_action: Callable[[Dict[str, str]], Dict[str, str]] = None
+    secret_patterns: Sequence[str] = None
 
     def __post_init__(self):
         self.long_name = self.long_name or self.name
         self.description = self.description or self.name
         self.env_prefix = self.env_prefix or self.name
+        if self.secret_patterns is None:
+            self.secret_patterns = SECRET_PATTERNS
+        elif isinstance(self.secret_patterns, str):
+            self.secret_patterns = (self.secret_patterns,)
+        self.secret_patterns = tuple(p.lower() for p in self.secret_patterns)
+
+
+@dataclass(frozen=True)
+class ArgSpec:
+    """Argument Specification. Describes a single input of the Action, as
+    defined in the ``action.yaml`` file.
+
+    Parameters
+    ----------
+    name: str
+        The name of the input (and CLI argument).
+    default: str
+        The default value of the input, as defined in the ``action.yaml``
+        file (i.e. environment variables are not yet expanded).
+    help: str
+        Help text for the input.
+    required: bool
+        Indicates if the input is required.
+    envar_keys: tuple of str
+        Environment Variables which are used to resolve the input, in order
+        of priority.
+    dest: str
+        The key of the input in the resolved arguments, as argparse would
+        name it (i.e. hyphens are replaced with underscores). Defaults to a
+        value derived from ``name``.
+    """
+    name: str
+    default: Optional[str]
+    help: Optional[str]
+    required: bool = False
+    envar_keys: Tuple[str, ...] = ()
+    dest: str = None
+
+    def __post_init__(self):
+        if self.dest is None:
+            object.__setattr__(self, 'dest', self.name.replace('-', '_'))
 
 
 def get_env(envar_list: Sequence[str], default: Optional[str] = None) -> str:
@@ -105,19 +162,187 @@ def get_env(envar_list: Sequence[str], default: Optional[str] = None) -> str:
     str
         The resolved Environment Variable.
     """
-    for _ in envar_list:
-        value = os.getenv(_, None)
-        if value:  # Only return on non-empty strings.
+    environ = os.environ
+    for key in envar_list:
+        if (value := environ.get(key)):  # Only return on non-empty strings.
             return value
     return default
 
 
+def load_inputs(
+    filename: str,
+    stat_key: Tuple[int, int] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Load the inputs section of an ``action.yaml`` file.
+
+    The parsed inputs are cached in a JSON file next to the ``action.yaml``
+    file (``<filename>.pyc-args``). The cache is keyed on the modification
+    time and size of the ``action.yaml`` file, and is only used when both
+    match; otherwise the file is parsed again and the cache refreshed.
+
+    Note
+    ----
+    Failures to read or write the cache are ignored, the ``action.yaml`` file
+    is then parsed as normal. The cache file is private to the user which
+    created it (mode 0600); other users parse the ``action.yaml`` file. Add
+    ``*.pyc-args`` and ``*.pyc-args.*.tmp`` to the ``.gitignore`` file of the
+    repository containing the Action.
+
+    Parameters
+    ----------
+    filename : str
+        Path to ``action.yaml`` file where Action inputs are defined.
+    stat_key : tuple of int
+        The modification time (in nanoseconds) and size of the
+        ``action.yaml`` file. When not specified the file is stat'ed.
+
+    Returns
+    -------
+    dict of {str : dict}
+        Dictionary of inputs, as defined in the ``action.yaml`` file.
+    """
+    cache_path = filename + '.pyc-args'
+    if stat_key is None:
+        st = os.stat(filename)
+        stat_key = (st.st_mtime_ns, st.st_size)
+    try:
+        with open(cache_path) as f:
+            cache = json.load(f)
+        inputs = cache['inputs']
+        if cache['key'] == list(stat_key) and isinstance(inputs, dict):
+            return inputs
+    except Exception:
+        pass
+    # Cache miss, parse the file and (atomically) update the cache.
+    with open(filename, 'rb') as f:
+        y = yaml.load(f, Loader=_Loader)
+    inputs = y['inputs']
+    try:
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=os.path.basename(cache_path) + '.',
+            suffix='.tmp',
+            dir=os.path.dirname(cache_path) or '.',
+        )
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'key': list(stat_key), 'inputs': inputs}, f)
+            os.replace(tmp_path, cache_path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+    except Exception:
+        pass
+    return inputs
+
+
+@functools.lru_cache(maxsize=8)
+def _compiled_parser(
+    filename: str,
+    stat_key: Tuple[int, int],
+    env_prefix: str,
+    description: str = None,
+) -> Tuple[Callable[[Sequence[str]], Dict[str, str]], Tuple[ArgSpec, ...]]:
+    """Compile a parser function for the inputs of an ``action.yaml`` file.
+
+    Compiled parsers are cached, keyed on the file name, modification time and
+    size of the ``action.yaml`` file (as well as the other parameters), so
+    that the inputs are only processed once for a given ``action.yaml`` file.
+
+    The returned parser function resolves each argument from the Environment,
+    or the default value (with any environment variables expanded), on every
+    call. CLI arguments, of the form ``--name value`` or ``--name=value``,
+    are scanned directly. Only when the CLI arguments cannot be handled by
+    the scanner (e.g. ``--help``, or unknown arguments) is an
+    ``argparse.ArgumentParser`` constructed (once), which then reports the
+    usage or error as normal.
+
+    Parameters
+    ----------
+    filename : str
+        Path to ``action.yaml`` file where Action inputs are defined.
+    stat_key : tuple of int
+        The modification time (in nanoseconds) and size of the
+        ``action.yaml`` file, see ``load_inputs()``.
+    env_prefix: str
+        Prefix used when resolving environment variables.
+    description: str
+        A description of the Action (used by the CLI help).
+
+    Returns
+    -------
+    Callable
+        Parser function, taking a list of CLI arguments and returning a
+        dictionary of the resolved arguments.
+    tuple of ArgSpec
+        The arguments defined by the ``action.yaml`` file.
+    """
+    prefix = env_prefix.replace(' ', '').upper()
+    arguments = list()
+    for name, input_dict in load_inputs(filename, stat_key).items():
+        arguments.append(ArgSpec(
+            name,
+            input_dict.get('default', None),
+            input_dict.get('help', None),
+            input_dict.get('required', False),
+            (f"{prefix}_{name.upper()}", f"INPUT_{name.upper()}"),
+        ))
+    arguments = tuple(arguments)
+    options = {f"--{arg_spec.name}": arg_spec.dest for arg_spec in arguments}
+    parser = None
+
+    def parse(argv: Sequence[str]) -> Dict[str, str]:
+        nonlocal parser
+        # Resolve each argument from the Environment, or the default value.
+        defaults = dict()
+        for arg_spec in arguments:
+            default = arg_spec.default
+            if isinstance(default, str) and '$' in default:
+                default = os.path.expandvars(default)
+            defaults[arg_spec.dest] = get_env(arg_spec.envar_keys, default)
+        if not argv:
+            # No CLI arguments, skip the (costly) argument parser.
+            return defaults
+        # Scan the CLI arguments.
+        values = dict()
+        tokens = iter(argv)
+        for token in tokens:
+            option, sep, value = token.partition('=')
+            dest = options.get(option)
+            if dest is None:
+                break
+            if not sep:
+                value = next(tokens, None)
+                if value is None or value.startswith('-'):
+                    break
+            values[dest] = value
+        else:
+            defaults.update(values)
+            return defaults
+        # Help requested, or unexpected arguments, defer to argparse.
+        if parser is None:
+            parser = argparse.ArgumentParser(description=description)
+            for arg_spec in arguments:
+                parser.add_argument(
+                    f"--{arg_spec.name}",
+                    required=False,
+                    type=str,
+                    help=arg_spec.help,
+                )
+        # The namespace carries the resolved defaults, CLI arguments
+        # override those values.
+        return vars(parser.parse_args(argv, argparse.Namespace(**defaults)))
+
+    return parse, arguments
+
+
 def parse_arguments(action_spec: ActionSpec) -> Tuple[Dict[str, str], bool]:
     """Parse arguments and resolve parameters.
 
     Arguments are taken from the CLI first, then the Environment, and lastly
     the default value (if specified). Default values, specified in the
     ``action.yaml`` file, have any included environment variables expanded.
+    The inputs of an ``action.yaml`` file are only processed once, see
+    ``_compiled_parser()``.
 
     The ``action.yaml`` is formatted as follows::
 
@@ -141,54 +366,28 @@ def parse_arguments(action_spec: ActionSpec) -> Tuple[Dict[str, str], bool]:
     Returns
     -------
     dict of {str : str}
-        Dictionary of arguments, from the call to ``parser.parse_args()``.
+        Dictionary of resolved arguments.
     bool
         Indicates if any required arguments were missing.
     """
-    # Parse the arguments from the "action.yaml" file.
-    ArgSpec = namedtuple(
-        'ArgSpec',
-        ['name', 'default', 'help', 'required'],
-        defaults=[False])
-    arguments = list()
-    with open(action_spec.filename) as f:
-        y = yaml.load(f.read(), Loader=yaml.SafeLoader)
-        for input in y['inputs']:
-            input_dict = y['inputs'][input]
-            default = input_dict.get('default', None)
-            if isinstance(default, str):
-                default = os.path.expandvars(default)
-            arguments.append(ArgSpec(
-                input,
-                default,
-                input_dict.get('help', None),
-                input_dict.get('required', False),
-            ))
-    parser = argparse.ArgumentParser(description=action_spec.description)
-    for arg_spec in arguments:
-        parser.add_argument(
-            f"--{arg_spec.name}",
-            required=False,
-            type=str,
-            default=get_env([
-                (
-                    f"{action_spec.env_prefix.replace(' ','').upper()}"
-                    f"_{arg_spec.name.upper()}"
-                ),
-                f"INPUT_{arg_spec.name.upper()}",
-            ], arg_spec.default),
-            help=arg_spec.help,
-        )
-    args = parser.parse_args()
+    st = os.stat(action_spec.filename)
+    parse, arguments = _compiled_parser(
+        action_spec.filename,
+        (st.st_mtime_ns, st.st_size),
+        action_spec.env_prefix,
+        action_spec.description,
+    )
+    args = parse(sys.argv[1:])
     # Check that all required arguments are present.
-    missing_args = False
-    for arg_spec in arguments:
-        if arg_spec.required:
-            if arg_spec.name not in args:
-                missing_args = True
-                logger.error('Missing required argument %s', arg_spec.name)
+    # (The dictionary always contains every argument, so check the values).
+    missing = [
+        arg_spec.name for arg_spec in arguments
+        if arg_spec.required and args.get(arg_spec.dest) in (None, '')
+    ]
+    for name in missing:
+        logger.error('Missing required argument %s', name)
     # Return args, and missing args condition.
-    return args, missing_args
+    return args, bool(missing)
 
 
 def action_main(action_spec: ActionSpec) -> Dict[str, Any]:
@@ -205,32 +404,37 @@ def action_main(action_spec: ActionSpec) -> Dict[str, Any]:
         Dictionary of outputs, from the call to ``action_spec.do_action()``.
     """
     args, missing_args = parse_arguments(action_spec)
-    args = vars(args) # Trims the Namespace object.
-    if action_spec.set_defaults:
-        args = action_spec.set_defaults(args)
-
-    logger.info('%s, with arguments:', action_spec.long_name)
-    for arg, val in sorted(args.items()):
-        if arg == 'token':
-            logger.info('  %s=********:', arg)
-            continue
-        logger.info('  %s=%s:', arg, val)
-
     if missing_args:
         logger.error('Some required arguments are missing!')
         exit(1)
+    if action_spec.set_defaults:
+        args = action_spec.set_defaults(args)
+
+    if logger.isEnabledFor(logging.INFO):
+        secret_names = frozenset(
+            arg for arg in args
+            if any(p in arg.lower() for p in action_spec.secret_patterns)
+        )
+        logger.info('%s, with arguments:', action_spec.long_name)
+        for arg, val in sorted(args.items()):
+            if arg in secret_names:
+                val = '********'
+            logger.info('  %s=%s:', arg, val)
 
     # Call the Action implementation.
     if action_spec.do_action:
         outputs = action_spec.do_action(args)
+        output_lines = list()
+        console_lines = list()
+        for name, result in outputs.items():
+            output_lines.append(f'{name}={result}\n')
+            console_lines.append(f'set-output name={name}::{result}\n')
         # Print the outputs (which get picked up by GitHub Action Runners).
         if 'GITHUB_OUTPUT' in os.environ:
             with open(os.environ['GITHUB_OUTPUT'], 'a') as fh:
-                for name, result in outputs.items():
-                    print(f'{name}={result}', file=fh)
+                fh.write(''.join(output_lines))
         # Unit Test Support
         #  print the results a second time directly to console.
-        for name, result in outputs.items():
-            print(f'set-output name={name}::{result}')
+        sys.stdout.write(''.join(console_lines))
         return outputs
     return {}
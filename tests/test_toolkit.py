@@ -2,7 +2,222 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+import json
+import os
+import pytest
+from action.toolkit.toolkit import (
+    ActionSpec, action_main, load_inputs, parse_arguments, _compiled_parser
+)
+
+
+ACTION_YAML = """---
+name: 'SomeAction'
+description: 'SomeAction GitHub Action.'
+inputs:
+  user:
+    description: 'User name.'
+    required: false
+  token:
+    description: 'API Key for the User.'
+    required: false
+    default: '${GHE_TOKEN}'
+"""
+
+HYPHEN_ACTION_YAML = """---
+name: 'SomeAction'
+description: 'SomeAction GitHub Action.'
+inputs:
+  github-token:
+    description: 'GitHub Token.'
+    required: true
+  my-input:
+    description: 'Some input.'
+    default: 'x'
+"""
+
+
+@pytest.fixture
+def action_yaml(tmp_path):
+    filename = tmp_path / 'action.yaml'
+    filename.write_text(ACTION_YAML)
+    return filename
+
+
 class Test_Toolkit():
 
     def test_nop(self):
         pass
+
+    def test_load_inputs_cache(self, action_yaml):
+        inputs = load_inputs(str(action_yaml))
+        assert list(inputs) == ['user', 'token']
+        assert inputs['token']['default'] == '${GHE_TOKEN}'
+        cache_path = str(action_yaml) + '.pyc-args'
+        assert os.path.exists(cache_path)
+        assert os.stat(cache_path).st_mode & 0o777 == 0o600
+        # Cache hit returns the cached inputs.
+        st = os.stat(action_yaml)
+        with open(cache_path, 'w') as f:
+            json.dump({
+                'key': [st.st_mtime_ns, st.st_size],
+                'inputs': {'cached': {}},
+            }, f)
+        assert load_inputs(str(action_yaml)) == {'cached': {}}
+        # Invalid cache is ignored.
+        with open(cache_path, 'w') as f:
+            f.write('not json')
+        assert list(load_inputs(str(action_yaml))) == ['user', 'token']
+        # Stale cache is ignored.
+        os.utime(action_yaml, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+        assert list(load_inputs(str(action_yaml))) == ['user', 'token']
+
+    def test_parse_arguments_required(self, action_yaml, monkeypatch):
+        action_yaml.write_text(ACTION_YAML.replace(
+            "User name.'\n    required: false",
+            "User name.'\n    required: true",
+        ))
+        monkeypatch.setattr('sys.argv', ['action'])
+        monkeypatch.delenv('FOO_USER', raising=False)
+        monkeypatch.delenv('INPUT_USER', raising=False)
+        spec = ActionSpec(filename=str(action_yaml), name='foo')
+        args, missing_args = parse_arguments(spec)
+        assert args['user'] is None
+        assert missing_args is True
+        monkeypatch.setenv('INPUT_USER', 'bob')
+        args, missing_args = parse_arguments(spec)
+        assert args['user'] == 'bob'
+        assert missing_args is False
+
+    def test_parse_arguments_required_falsy(self, action_yaml, monkeypatch):
+        action_yaml.write_text(ACTION_YAML.replace(
+            "User name.'\n    required: false",
+            "User name.'\n    required: true\n    default: false",
+        ))
+        monkeypatch.setattr('sys.argv', ['action'])
+        monkeypatch.delenv('FOO_USER', raising=False)
+        monkeypatch.delenv('INPUT_USER', raising=False)
+        spec = ActionSpec(filename=str(action_yaml), name='foo')
+        args, missing_args = parse_arguments(spec)
+        assert args['user'] is False
+        assert missing_args is False
+
+    def test_parse_arguments_cli(self, action_yaml, monkeypatch):
+        monkeypatch.setenv('INPUT_USER', 'bob')
+        monkeypatch.setenv('GHE_TOKEN', 'env_token')
+        spec = ActionSpec(filename=str(action_yaml), name='foo')
+        monkeypatch.setattr('sys.argv', ['action'])
+        args, _ = parse_arguments(spec)
+        assert args == {'user': 'bob', 'token': 'env_token'}
+        monkeypatch.setattr('sys.argv', ['action', '--user', 'alice'])
+        args, _ = parse_arguments(spec)
+        assert args == {'user': 'alice', 'token': 'env_token'}
+        monkeypatch.setattr('sys.argv', ['action', '--token=cli_token'])
+        args, _ = parse_arguments(spec)
+        assert args == {'user': 'bob', 'token': 'cli_token'}
+        monkeypatch.setattr('sys.argv', ['action', '--foo', 'bar'])
+        with pytest.raises(SystemExit):
+            parse_arguments(spec)
+
+    def test_parse_arguments_hyphen(self, action_yaml, monkeypatch):
+        action_yaml.write_text(HYPHEN_ACTION_YAML)
+        monkeypatch.setattr('sys.argv', ['action'])
+        monkeypatch.setenv('INPUT_GITHUB-TOKEN', 't')
+        spec = ActionSpec(filename=str(action_yaml), name='foo')
+        args, missing_args = parse_arguments(spec)
+        assert args == {'github_token': 't', 'my_input': 'x'}
+        assert missing_args is False
+        # Scanned CLI arguments.
+        monkeypatch.setattr('sys.argv', ['action', '--my-input', 'y'])
+        args, _ = parse_arguments(spec)
+        assert args == {'github_token': 't', 'my_input': 'y'}
+        # Abbreviated option, handled by argparse.
+        monkeypatch.setattr('sys.argv', ['action', '--my-inp', 'y'])
+        args, _ = parse_arguments(spec)
+        assert args == {'github_token': 't', 'my_input': 'y'}
+
+    def test_parse_arguments_cached_parser(self, action_yaml, monkeypatch):
+        monkeypatch.setattr('sys.argv', ['action'])
+        spec = ActionSpec(filename=str(action_yaml), name='foo')
+        info = _compiled_parser.cache_info()
+        parse_arguments(spec)
+        parse_arguments(spec)
+        assert _compiled_parser.cache_info().misses == info.misses + 1
+        assert _compiled_parser.cache_info().hits == info.hits + 1
+
+    def test_parse_arguments_changed_file(self, action_yaml, monkeypatch):
+        monkeypatch.setattr('sys.argv', ['action'])
+        monkeypatch.setenv('INPUT_NAME', 'bob')
+        spec = ActionSpec(filename=str(action_yaml), name='foo')
+        args, _ = parse_arguments(spec)
+        assert list(args) == ['user', 'token']
+        # Same size file, only the modification time identifies the change.
+        st = os.stat(action_yaml)
+        action_yaml.write_text(ACTION_YAML.replace('user:', 'name:'))
+        os.utime(action_yaml, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+        args, _ = parse_arguments(spec)
+        assert list(args) == ['name', 'token']
+        assert args['name'] == 'bob'
+
+    def test_action_main_missing_args(self, action_yaml, monkeypatch, caplog):
+        action_yaml.write_text(ACTION_YAML.replace(
+            "User name.'\n    required: false",
+            "User name.'\n    required: true",
+        ))
+        monkeypatch.setattr('sys.argv', ['action'])
+        monkeypatch.delenv('FOO_USER', raising=False)
+        monkeypatch.delenv('INPUT_USER', raising=False)
+        calls = list()
+
+        def set_defaults(args):
+            calls.append(args)
+            return args
+
+        caplog.set_level('INFO')
+        spec = ActionSpec(
+            filename=str(action_yaml),
+            name='foo',
+            set_defaults=set_defaults,
+        )
+        with pytest.raises(SystemExit) as e:
+            action_main(spec)
+        assert e.value.code == 1
+        assert calls == []
+        assert 'Missing required argument user' in caplog.messages
+        assert not any(m.startswith('  user=') for m in caplog.messages)
+
+    def test_action_main_outputs(
+        self, tmp_path, action_yaml, monkeypatch, capsys
+    ):
+        output_file = tmp_path / 'github_output'
+        monkeypatch.setattr('sys.argv', ['action'])
+        monkeypatch.setenv('GITHUB_OUTPUT', str(output_file))
+        spec = ActionSpec(
+            filename=str(action_yaml),
+            name='foo',
+            do_action=lambda args: {'foo': 'bar', 'one': 1},
+        )
+        assert action_main(spec) == {'foo': 'bar', 'one': 1}
+        assert output_file.read_text() == 'foo=bar\none=1\n'
+        assert capsys.readouterr().out == (
+            'set-output name=foo::bar\n'
+            'set-output name=one::1\n'
+        )
+
+    def test_action_main_secrets(self, action_yaml, monkeypatch, caplog):
+        monkeypatch.setattr('sys.argv', ['action'])
+        monkeypatch.setenv('INPUT_USER', 'bob')
+        monkeypatch.setenv('GHE_TOKEN', 'env_token')
+        caplog.set_level('INFO')
+        action_main(ActionSpec(filename=str(action_yaml), name='foo'))
+        assert '  token=********:' in caplog.messages
+        assert '  user=bob:' in caplog.messages
+        caplog.clear()
+        action_main(ActionSpec(
+            filename=str(action_yaml), name='foo', secret_patterns=['USER']))
+        assert '  token=env_token:' in caplog.messages
+        assert '  user=********:' in caplog.messages
+        caplog.clear()
+        action_main(ActionSpec(
+            filename=str(action_yaml), name='foo', secret_patterns='token'))
+        assert '  token=********:' in caplog.messages
+        assert '  user=bob:' in caplog.messages